@@ -0,0 +1,108 @@
+"""
+Chat History Benchmark
+Show that per-rerun render cost and session memory stay flat as a
+conversation grows, compared with the old unbounded list of turns.
+
+Streamlit itself is not run. ``legacy ms`` and ``render ms`` time only the
+HTML string building each rerun does; the Streamlit element calls, which
+each send a delta to the browser and usually dominate a rerun, are counted
+instead in the ``elements`` columns.
+
+Usage:
+    python benchmark_chat_history.py
+    python benchmark_chat_history.py --turns 10 100 1000 10000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from chat_history import ChatHistory, RENDER_WINDOW, REWRITE_HISTORY_TOKENS
+
+QUESTION = "What does the speaker say about reciprocal rank fusion in turn {}?"
+ANSWER = ("The speaker explains that reciprocal rank fusion merges the lexical and "
+          "vector rankings without score calibration, using a constant of sixty. ") * 3
+
+
+# st.container, two st.markdown calls and st.divider per turn in the old main()
+LEGACY_ELEMENTS_PER_TURN = 4
+
+
+def legacy_render(turns):
+    """
+    Build the markdown bodies the old ``main()`` passed to ``st.markdown``
+    on every rerun, one string per call, verbatim (the old code did not escape).
+    """
+    parts = []
+    for question, answer in turns:
+        parts.append(f"""
+                    <div class="user-message">
+                        💭 {question}
+                    </div>
+                    """)
+        parts.append(f"""
+                    <div class="bot-message">
+                        🤖 {answer}
+                    </div>
+                    """)
+    return parts
+
+
+def bounded_elements(history, visible=RENDER_WINDOW):
+    """Count the Streamlit elements the current ``main()`` creates for the history."""
+    elements = 1  # st.markdown for the rendered window
+    if history.summary:
+        elements += 2  # st.expander and its st.markdown
+    if len(history) > visible:
+        elements += 1  # "Show older messages" st.button
+    return elements
+
+
+def build(n_turns, bounded):
+    """Build a history of ``n_turns`` turns and return it with its traced size in bytes."""
+    tracemalloc.start()
+    history = ChatHistory() if bounded else []
+    for i in range(n_turns):
+        question = QUESTION.format(i)
+        answer = f"{ANSWER}({i})"
+        if bounded:
+            history.add(question, answer)
+        else:
+            history.append((question, answer))
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return history, size
+
+
+def time_call(run, repeat):
+    """Fastest of ``repeat`` runs, in milliseconds."""
+    best = None
+    for _ in range(repeat):
+        began = time.perf_counter()
+        run()
+        elapsed = (time.perf_counter() - began) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chat history render time and memory")
+    parser.add_argument("--turns", nargs="+", type=int, default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'turns':>8}{'legacy ms':>12}{'legacy elements':>17}{'legacy KiB':>12}"
+          f"{'render ms':>12}{'elements':>10}{'window ms':>12}{'bounded KiB':>13}")
+    for n_turns in args.turns:
+        legacy, legacy_size = build(n_turns, bounded=False)
+        history, size = build(n_turns, bounded=True)
+        legacy_ms = time_call(lambda: legacy_render(legacy), args.repeat)
+        render_ms = time_call(lambda: history.render(RENDER_WINDOW), args.repeat)
+        window_ms = time_call(lambda: history.window_text(REWRITE_HISTORY_TOKENS), args.repeat)
+        print(f"{n_turns:>8}{legacy_ms:>12.3f}{n_turns * LEGACY_ELEMENTS_PER_TURN:>17}"
+              f"{legacy_size / 1024:>12.1f}{render_ms:>12.3f}{bounded_elements(history):>10}"
+              f"{window_ms:>12.3f}{size / 1024:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Retrieval Benchmark
+Measure query latency and recall@k for the lexical, vector and hybrid modes.
+
+Usage:
+    python benchmark_retrieval.py eval_fixtures/*.json
+    python benchmark_retrieval.py eval_fixtures/asyncio_in_practice.json --modes lexical --k 2
+
+A fixture is a JSON file with ``snippets`` ({text, start, duration}) and
+``questions`` ({question, timestamp}). A retrieved chunk counts as relevant
+when its time span covers the labeled timestamp. Fixtures that split into
+no more than ``k`` chunks are skipped, since every chunk would be returned
+and recall@k would be trivially 1.0.
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from retrieval import BM25Index, RETRIEVAL_MODES, TOP_K, retrieve, split_transcript
+
+
+def load_fixture(path):
+    """
+    Load a labeled transcript fixture.
+
+    Args:
+        path (str): Path to the fixture JSON file
+
+    Returns:
+        tuple: (snippets, questions) where snippets are (text, start, duration)
+        tuples and questions are (question, timestamp) tuples
+
+    Raises:
+        ValueError: If the fixture is malformed or has no snippets or questions
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    try:
+        snippets = [(s["text"], s["start"], s["duration"]) for s in data["snippets"]]
+        questions = [(q["question"], q["timestamp"]) for q in data["questions"]]
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"{path}: malformed fixture ({e!r})") from e
+    if not snippets:
+        raise ValueError(f"{path}: fixture has no snippets")
+    if not questions:
+        raise ValueError(f"{path}: fixture has no questions")
+    return snippets, questions
+
+
+def is_relevant(doc, timestamp):
+    """Return True if the chunk's time span covers the timestamp."""
+    return doc.metadata["start"] <= timestamp < doc.metadata["end"]
+
+
+def rank_of_first_hit(docs, timestamp):
+    """Return the 1-based rank of the first relevant chunk, or None."""
+    for rank, doc in enumerate(docs, start=1):
+        if is_relevant(doc, timestamp):
+            return rank
+    return None
+
+
+def load_embeddings():
+    """Load the same embedding model the app uses."""
+    from langchain_huggingface import HuggingFaceEmbeddings
+
+    return HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+
+
+def build_vector_store(chunks, embeddings):
+    """Build a FAISS store over the chunks."""
+    from langchain_community.vectorstores import FAISS
+
+    return FAISS.from_documents(chunks, embeddings)
+
+
+def time_queries(questions, search, repeat=1):
+    """
+    Run every question through ``search`` and time each call.
+
+    Args:
+        questions (list): (question, timestamp) tuples
+        search (callable): Function mapping a question to ranked Documents
+        repeat (int): Times to repeat each query; the fastest run is kept
+
+    Returns:
+        tuple: (per-query latencies in milliseconds, first-hit ranks,
+        retrieved Documents per query)
+    """
+    latencies = []
+    ranks = []
+    retrieved = []
+    for question, timestamp in questions:
+        best = None
+        for _ in range(repeat):
+            began = time.perf_counter()
+            docs = search(question)
+            elapsed = (time.perf_counter() - began) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        latencies.append(best)
+        ranks.append(rank_of_first_hit(docs, timestamp))
+        retrieved.append(docs)
+    return latencies, ranks, retrieved
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("fixtures", nargs="+", help="Labeled transcript fixtures")
+    parser.add_argument("--modes", nargs="+", choices=RETRIEVAL_MODES, default=list(RETRIEVAL_MODES))
+    parser.add_argument("--k", type=int, default=TOP_K)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query (fastest kept)")
+    args = parser.parse_args()
+
+    needs_vectors = any(mode != "lexical" for mode in args.modes)
+    embeddings = load_embeddings() if needs_vectors else None
+
+    results = {mode: ([], []) for mode in args.modes}
+    for path in args.fixtures:
+        snippets, questions = load_fixture(path)
+        chunks = split_transcript(snippets)
+        if args.k >= len(chunks):
+            print(f"{path}: skipped, k={args.k} covers all {len(chunks)} chunks")
+            continue
+
+        began = time.perf_counter()
+        lexical_index = BM25Index(chunks)
+        print(f"{path}: {len(chunks)} chunks, BM25 build "
+              f"{(time.perf_counter() - began) * 1000:.2f} ms, "
+              f"postings {lexical_index.memory_bytes()} bytes")
+
+        vector_store = None
+        if needs_vectors:
+            began = time.perf_counter()
+            vector_store = build_vector_store(chunks, embeddings)
+            print(f"{path}: FAISS build {(time.perf_counter() - began) * 1000:.2f} ms")
+
+        for mode in args.modes:
+            def search(question, mode=mode):
+                return retrieve(question, lexical_index, vector_store, mode=mode, k=args.k)
+
+            latencies, ranks, _ = time_queries(questions, search, repeat=args.repeat)
+            results[mode][0].extend(latencies)
+            results[mode][1].extend(ranks)
+
+    if not results[args.modes[0]][1]:
+        raise SystemExit("No fixture has more chunks than k; nothing to report")
+
+    print()
+    print(f"{'mode':<10}{'queries':>9}{f'recall@{args.k}':>11}{'mean ms':>11}{'p95 ms':>11}")
+    for mode, (latencies, ranks) in results.items():
+        recall = sum(rank is not None for rank in ranks) / len(ranks)
+        print(f"{mode:<10}{len(ranks):>9}{recall:>11.3f}"
+              f"{statistics.mean(latencies):>11.3f}{percentile(latencies, 95):>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+YouTube URL Parsing Benchmark
+Check the URL parser against a labeled corpus and measure URLs/sec.
+
+Usage:
+    python benchmark_youtube_utils.py
+    python benchmark_youtube_utils.py --corpus eval_fixtures/youtube_urls.tsv --count 500000
+
+The corpus is a tab-separated file of ``input, video_id, start, playlist_id,
+kind`` (empty column = None, lines starting with ``#`` are comments). A row
+expecting several links lists them in order, with ``|`` separating the
+values in each of the video_id, start and playlist_id columns. Rows of
+kind ``url`` are bare URLs and are checked through ``parse_youtube_url``,
+``get_youtube_video_id`` and ``extract_youtube_links``; rows of kind ``text``
+are free text and are checked through ``extract_youtube_links`` only, which
+must return every expected link and nothing else. Throughput is
+measured on ``--count`` URLs shaped like the corpus entries, each with a fresh
+random video ID so deduplication cannot skip the work.
+"""
+
+import argparse
+import os
+import random
+import re
+import string
+import tempfile
+import time
+from urllib.parse import urlparse, parse_qs
+
+from youtube_utils import (
+    YouTubeLink, extract_youtube_links, extract_youtube_links_from_file,
+    get_youtube_video_id, parse_youtube_url
+)
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "eval_fixtures", "youtube_urls.tsv")
+
+
+def legacy_get_youtube_video_id(url):
+    """The previous ``get_youtube_video_id``, kept verbatim as the baseline."""
+    if not url or not isinstance(url, str):
+        return None
+
+    patterns = [
+        r'(?:v=|\/)([0-9A-Za-z_-]{11}).*',
+        r'(?:embed\/)([0-9A-Za-z_-]{11})',
+        r'(?:youtu\.be\/)([0-9A-Za-z_-]{11})',
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, url)
+        if match:
+            return match.group(1)
+
+    try:
+        parsed_url = urlparse(url)
+        if parsed_url.hostname in ['www.youtube.com', 'youtube.com', 'm.youtube.com']:
+            if parsed_url.path == '/watch':
+                return parse_qs(parsed_url.query).get('v', [None])[0]
+            elif parsed_url.path.startswith('/embed/'):
+                return parsed_url.path.split('/')[2]
+            elif parsed_url.path.startswith('/v/'):
+                return parsed_url.path.split('/')[2]
+        elif parsed_url.hostname == 'youtu.be':
+            return parsed_url.path[1:]
+    except Exception:
+        pass
+
+    return None
+
+
+def load_corpus(path):
+    """
+    Load the labeled URL corpus.
+
+    Args:
+        path (str): Path to the TSV corpus
+
+    Returns:
+        list: (input, list of expected YouTubeLinks, kind) tuples
+    """
+    cases = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line or line.startswith("#"):
+                continue
+            text, video_ids, starts, playlist_ids, kind = line.split("\t")
+            expected = []
+            if video_ids or playlist_ids:
+                columns = (value.split("|") for value in (video_ids, starts, playlist_ids))
+                for video_id, start, playlist_id in zip(*columns):
+                    expected.append(YouTubeLink(
+                        video_id or None, int(start) if start else None, playlist_id or None
+                    ))
+            cases.append((text, expected, kind))
+    return cases
+
+
+def check_corpus(cases):
+    """
+    Compare the new API and the legacy extractor against the corpus.
+
+    Returns:
+        tuple: (list of (function, input, expected, actual) failures,
+        number of correct legacy video IDs)
+    """
+    failures = []
+    legacy_correct = 0
+    for text, expected, kind in cases:
+        first = expected[0] if expected else None
+        expected_id = first.video_id if first else None
+        checks = [("extract_youtube_links", list(extract_youtube_links([text], dedupe=False)), expected)]
+        if kind == "url":
+            checks.append(("parse_youtube_url", parse_youtube_url(text), first))
+            checks.append(("get_youtube_video_id", get_youtube_video_id(text), expected_id))
+        for name, actual, wanted in checks:
+            if actual != wanted:
+                failures.append((name, text, wanted, actual))
+        if legacy_get_youtube_video_id(text) == expected_id:
+            legacy_correct += 1
+    return failures, legacy_correct
+
+
+def make_workload(cases, count, seed=0):
+    """
+    Build ``count`` URLs by cycling the corpus and swapping in random video IDs.
+
+    Args:
+        cases (list): Output of ``load_corpus``
+        count (int): Number of URLs to generate
+        seed (int): Random seed
+
+    Returns:
+        list: URL strings
+    """
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + "-_"
+    urls = []
+    for i in range(count):
+        url, expected, _ = cases[i % len(cases)]
+        for link in expected:
+            if link.video_id:
+                url = url.replace(link.video_id, "".join(rng.choices(alphabet, k=11)))
+        urls.append(url)
+    return urls
+
+
+def throughput(label, count, run):
+    """Time ``run()`` and print URLs/sec."""
+    began = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - began
+    print(f"{label:<44}{count / elapsed:>14,.0f} URLs/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark YouTube URL parsing")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--count", type=int, default=200000, help="URLs to parse per throughput run")
+    args = parser.parse_args()
+
+    cases = load_corpus(args.corpus)
+    failures, legacy_correct = check_corpus(cases)
+    failed_inputs = {text for _, text, _, _ in failures}
+    print(f"new API: {len(cases) - len(failed_inputs)}/{len(cases)} inputs correct")
+    print(f"legacy get_youtube_video_id: {legacy_correct}/{len(cases)} correct video IDs")
+    for name, text, expected, actual in failures:
+        print(f"  FAIL {name}({text!r}): expected {expected}, got {actual}")
+
+    urls = make_workload(cases, args.count)
+    print()
+    throughput("legacy get_youtube_video_id", len(urls),
+               lambda: [legacy_get_youtube_video_id(url) for url in urls])
+    throughput("get_youtube_video_id", len(urls),
+               lambda: [get_youtube_video_id(url) for url in urls])
+    throughput("parse_youtube_url", len(urls),
+               lambda: [parse_youtube_url(url) for url in urls])
+    throughput("extract_youtube_links (no dedupe)", len(urls),
+               lambda: list(extract_youtube_links(urls, dedupe=False)))
+    throughput("extract_youtube_links (dedupe)", len(urls),
+               lambda: list(extract_youtube_links(urls)))
+
+    with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False, encoding="utf-8") as f:
+        for url in urls:
+            f.write(f"2024-01-01T00:00:00Z INFO pasted link {url} by user\n")
+    try:
+        throughput("extract_youtube_links_from_file (log lines)", len(urls),
+                   lambda: list(extract_youtube_links_from_file(f.name)))
+    finally:
+        os.remove(f.name)
+
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Chat History Module
+Bounded chat history with a rolling summary and token-bounded history windows.
+
+Only the most recent turns are kept verbatim; older turns are folded into a
+short extractive summary, so session memory and rerun render time stay flat
+however long the conversation gets. Each turn's markup is built once when the
+turn is added, so a rerun only joins strings for the visible window.
+"""
+
+import html
+from collections import deque
+
+from retrieval import estimate_tokens
+
+# Turns kept verbatim before the oldest are compacted into the summary
+MAX_TURNS = 30
+# Token budget for the rolling summary of compacted turns
+SUMMARY_MAX_TOKENS = 400
+# Turns rendered per page in the chat view
+RENDER_WINDOW = 6
+# Token budget for the history passed to the question rewriter
+REWRITE_HISTORY_TOKENS = 300
+# Characters of an answer kept in summaries and rewrite windows
+ANSWER_SNIPPET_CHARS = 240
+# Token budget for the line listing topics of turns folded out of the summary
+SUMMARY_TOPICS_TOKENS = 100
+# Characters of a question kept as a topic in that line
+TOPIC_CHARS = 60
+
+REWRITE_TEMPLATE = """
+Given the conversation about a YouTube video and a follow-up question, rewrite the
+follow-up as a standalone question that can be understood without the conversation.
+Keep names, numbers and technical terms exactly as written.
+If the question is already standalone, return it unchanged.
+Return ONLY the rewritten question.
+
+Conversation:
+{history}
+
+Follow-up question: {question}
+
+Standalone question:"""
+
+
+def render_turn(question, answer):
+    """
+    Build the chat bubble markup for one question/answer pair.
+
+    The question is escaped and kept on one HTML line. The answer sits between
+    blank lines inside its bubble, which ends the HTML block so ``st.markdown``
+    renders the answer's lists, emphasis and code as Markdown.
+
+    Args:
+        question (str): User question
+        answer (str): Assistant answer (Markdown)
+
+    Returns:
+        str: Markup for both messages
+    """
+    question = html.escape(question).replace("\n", "<br>")
+    return (
+        f'<div class="user-message">💭 {question}</div>\n'
+        f'<div class="bot-message">🤖\n\n{answer.strip()}\n\n</div>'
+    )
+
+
+def _snippet(text, limit=ANSWER_SNIPPET_CHARS):
+    """Collapse whitespace and cut text to ``limit`` characters."""
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+class ChatHistory:
+    """
+    Chat turns capped at ``max_turns`` plus a rolling summary of older turns.
+
+    Turns are stored as ``(question, answer, markup)`` tuples, oldest first.
+    Each compacted turn gets a summary line; when those lines outgrow
+    ``summary_max_tokens`` the oldest are folded into a single coarser line
+    that counts them and lists their questions as topics, so every compacted
+    turn stays represented.
+    """
+
+    def __init__(self, max_turns=MAX_TURNS, summary_max_tokens=SUMMARY_MAX_TOKENS,
+                 topics_max_tokens=SUMMARY_TOPICS_TOKENS):
+        self.max_turns = max_turns
+        self.summary_max_tokens = summary_max_tokens
+        self.topics_max_tokens = topics_max_tokens
+        self.turns = deque()
+        self.compacted = 0
+        self._summary_lines = deque()
+        self._summary_tokens = 0
+        self._folded = 0
+        self._topics = deque()
+        self._topics_line = ""
+        self._topics_tokens = 0
+
+    def __len__(self):
+        return len(self.turns)
+
+    def __iter__(self):
+        return ((question, answer) for question, answer, _ in self.turns)
+
+    @property
+    def summary(self):
+        """Rolling summary of compacted turns, oldest first."""
+        lines = (line for line, _ in self._summary_lines)
+        if self._topics_line:
+            return "\n".join((self._topics_line, *lines))
+        return "\n".join(lines)
+
+    def add(self, question, answer):
+        """Append a turn, compacting the oldest turns past ``max_turns``."""
+        self.turns.append((question, answer, render_turn(question, answer)))
+        while len(self.turns) > self.max_turns:
+            old_question, old_answer, _ = self.turns.popleft()
+            self._add_to_summary(old_question, old_answer)
+
+    def clear(self):
+        """Drop all turns and the summary."""
+        self.turns.clear()
+        self._summary_lines.clear()
+        self._summary_tokens = 0
+        self._folded = 0
+        self._topics.clear()
+        self._topics_line = ""
+        self._topics_tokens = 0
+        self.compacted = 0
+
+    def render(self, count):
+        """
+        Return the HTML for the most recent ``count`` turns, oldest first.
+
+        Args:
+            count (int): Number of turns to render
+
+        Returns:
+            str: Joined turn markup
+        """
+        start = max(len(self.turns) - count, 0)
+        return "\n\n<hr>\n\n".join(
+            self.turns[i][2] for i in range(start, len(self.turns))
+        )
+
+    def window_text(self, max_tokens=REWRITE_HISTORY_TOKENS):
+        """
+        Format the most recent history that fits in a token budget.
+
+        Recent turns are added newest first until the budget is spent; the
+        rolling summary is included only if room is left.
+
+        Args:
+            max_tokens (int): Approximate token budget
+
+        Returns:
+            str: History text, oldest first
+        """
+        lines = []
+        used = 0
+        for question, answer, _ in reversed(self.turns):
+            line = f"User: {_snippet(question)}\nAssistant: {_snippet(answer)}"
+            tokens = estimate_tokens(line)
+            if used + tokens > max_tokens:
+                break
+            lines.append(line)
+            used += tokens
+        else:
+            summary = self.summary
+            if summary and used + self._summary_tokens + self._topics_tokens <= max_tokens:
+                lines.append(f"Earlier in the conversation:\n{summary}")
+        return "\n".join(reversed(lines))
+
+    def _add_to_summary(self, question, answer):
+        line = f"- {_snippet(question, 120)} → {_snippet(answer, 160)}"
+        self._summary_lines.append((line, _snippet(question, TOPIC_CHARS)))
+        self._summary_tokens += estimate_tokens(line)
+        self.compacted += 1
+        while (self._summary_tokens + self._topics_tokens > self.summary_max_tokens
+               and len(self._summary_lines) > 1):
+            line, topic = self._summary_lines.popleft()
+            self._summary_tokens -= estimate_tokens(line)
+            self._fold(topic)
+
+    def _fold(self, topic):
+        """Merge one summary line into the coarse topics line."""
+        self._folded += 1
+        self._topics.append(topic)
+        while True:
+            # Oldest topics give way first; their turns are still counted
+            self._topics_line = (f"- {self._folded} earlier turns, "
+                                 f"about: {'; '.join(self._topics)}")
+            self._topics_tokens = estimate_tokens(self._topics_line)
+            if self._topics_tokens <= self.topics_max_tokens or len(self._topics) == 1:
+                return
+            self._topics.popleft()
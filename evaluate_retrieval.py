@@ -0,0 +1,216 @@
+"""
+Retrieval Evaluation Harness
+Sweep chunking, k and retrieval modes over labeled fixtures and report
+quality against cost in a single table.
+
+Usage:
+    python evaluate_retrieval.py eval_fixtures/*.json
+    python evaluate_retrieval.py eval_fixtures/*.json --modes lexical \\
+        --chunk-sizes 500 1000 --overlaps 0 200 --k 2 4 --min-recall 0.9
+
+For every (chunk_size, chunk_overlap, mode, k) configuration it reports
+recall@k, MRR, mean prompt tokens, index build time and query latency.
+Configurations meeting ``--min-recall`` are ranked by prompt tokens so the
+cheapest acceptable one is listed first. A configuration is flagged
+``trivial`` when k is at least the chunk count of some fixture, since that
+fixture's whole index comes back; trivial configurations never meet the bar.
+"""
+
+import argparse
+import itertools
+import statistics
+import time
+
+import pandas as pd
+
+from benchmark_retrieval import (
+    build_vector_store, load_embeddings, load_fixture, percentile, time_queries
+)
+from retrieval import (
+    BM25Index, CHUNK_OVERLAP, CHUNK_SIZE, PROMPT_TEMPLATE, RETRIEVAL_MODES, TOP_K,
+    estimate_tokens, format_docs, retrieve, split_transcript
+)
+
+
+def build_indexes(snippets, chunk_size, chunk_overlap, embeddings=None):
+    """
+    Chunk a transcript and build the indexes the app would build at ingest.
+
+    Args:
+        snippets (list): (text, start, duration) tuples
+        chunk_size (int): Maximum characters per chunk
+        chunk_overlap (int): Characters shared between neighbouring chunks
+        embeddings: Embedding model, or None to skip the vector store
+
+    Returns:
+        dict: ``chunks``, ``lexical_index``, ``vector_store`` and build
+        times in milliseconds (``lexical_build_ms``, ``vector_build_ms``)
+    """
+    chunks = split_transcript(snippets, chunk_size, chunk_overlap)
+
+    began = time.perf_counter()
+    lexical_index = BM25Index(chunks)
+    lexical_build_ms = (time.perf_counter() - began) * 1000
+
+    vector_store = None
+    vector_build_ms = 0.0
+    if embeddings is not None:
+        began = time.perf_counter()
+        vector_store = build_vector_store(chunks, embeddings)
+        vector_build_ms = (time.perf_counter() - began) * 1000
+
+    return {
+        "chunks": chunks,
+        "lexical_index": lexical_index,
+        "vector_store": vector_store,
+        "lexical_build_ms": lexical_build_ms,
+        "vector_build_ms": vector_build_ms,
+    }
+
+
+def evaluate_config(fixtures, chunk_size, chunk_overlap, modes, ks, embeddings=None, repeat=3):
+    """
+    Evaluate one chunking configuration across modes and k values.
+
+    Args:
+        fixtures (list): (snippets, questions) pairs from ``load_fixture``
+        chunk_size (int): Maximum characters per chunk
+        chunk_overlap (int): Characters shared between neighbouring chunks
+        modes (list): Retrieval modes to evaluate
+        ks (list): Numbers of retrieved chunks to evaluate
+        embeddings: Embedding model, required for ``vector`` and ``hybrid``
+        repeat (int): Runs per query (fastest kept)
+
+    Returns:
+        list: One result dict per (mode, k)
+    """
+    built = [build_indexes(snippets, chunk_size, chunk_overlap, embeddings)
+             for snippets, _ in fixtures]
+    n_chunks = sum(len(b["chunks"]) for b in built)
+    min_chunks = min(len(b["chunks"]) for b in built)
+
+    rows = []
+    for mode, k in itertools.product(modes, ks):
+        latencies = []
+        ranks = []
+        prompt_tokens = []
+        build_ms = 0.0
+        for indexes, (_, questions) in zip(built, fixtures):
+            build_ms += indexes["lexical_build_ms"]
+            if mode != "lexical":
+                build_ms += indexes["vector_build_ms"]
+
+            def search(question):
+                return retrieve(
+                    question,
+                    indexes["lexical_index"],
+                    indexes["vector_store"],
+                    mode=mode,
+                    k=k
+                )
+
+            fixture_latencies, fixture_ranks, retrieved = time_queries(questions, search, repeat=repeat)
+            latencies.extend(fixture_latencies)
+            ranks.extend(fixture_ranks)
+            for (question, _), docs in zip(questions, retrieved):
+                prompt = PROMPT_TEMPLATE.format(context=format_docs(docs), question=question)
+                prompt_tokens.append(estimate_tokens(prompt))
+
+        rows.append({
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+            "mode": mode,
+            "k": k,
+            "chunks": n_chunks,
+            "trivial": k >= min_chunks,
+            "recall@k": sum(rank is not None for rank in ranks) / len(ranks),
+            "mrr": sum(1 / rank for rank in ranks if rank) / len(ranks),
+            "prompt_tokens": statistics.mean(prompt_tokens),
+            "build_ms": build_ms,
+            "query_ms": statistics.mean(latencies),
+            "p95_query_ms": percentile(latencies, 95),
+        })
+    return rows
+
+
+def run_sweep(fixtures, chunk_sizes, overlaps, modes, ks, embeddings=None, repeat=3):
+    """
+    Evaluate every valid combination of the given parameters.
+
+    Overlaps that are not smaller than the chunk size are skipped.
+
+    Returns:
+        pandas.DataFrame: One row per configuration
+    """
+    rows = []
+    for chunk_size, chunk_overlap in itertools.product(chunk_sizes, overlaps):
+        if chunk_overlap >= chunk_size:
+            continue
+        rows.extend(evaluate_config(
+            fixtures, chunk_size, chunk_overlap, modes, ks, embeddings, repeat
+        ))
+    return pd.DataFrame(rows)
+
+
+def rank_configs(results, min_recall):
+    """
+    Order configurations from cheapest acceptable to worst.
+
+    Non-trivial configurations meeting ``min_recall`` come first, ordered by
+    prompt tokens and then query latency; the rest follow ordered by recall.
+
+    Args:
+        results (pandas.DataFrame): Output of ``run_sweep``
+        min_recall (float): Quality bar for recall@k
+
+    Returns:
+        pandas.DataFrame: Sorted results with a ``meets_bar`` column
+    """
+    results = results.assign(meets_bar=(results["recall@k"] >= min_recall) & ~results["trivial"])
+    return results.sort_values(
+        ["meets_bar", "prompt_tokens", "query_ms", "recall@k"],
+        ascending=[False, True, True, False]
+    ).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep retrieval settings over labeled fixtures")
+    parser.add_argument("fixtures", nargs="+", help="Labeled transcript fixtures")
+    parser.add_argument("--chunk-sizes", nargs="+", type=int, default=[500, CHUNK_SIZE, 1500])
+    parser.add_argument("--overlaps", nargs="+", type=int, default=[0, 100, CHUNK_OVERLAP])
+    parser.add_argument("--k", nargs="+", type=int, default=[2, TOP_K, 6])
+    parser.add_argument("--modes", nargs="+", choices=RETRIEVAL_MODES, default=list(RETRIEVAL_MODES))
+    parser.add_argument("--min-recall", type=float, default=0.9, help="Quality bar for recall@k")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per query (fastest kept)")
+    parser.add_argument("--csv", help="Also write the results table to this path")
+    args = parser.parse_args()
+
+    fixtures = [load_fixture(path) for path in args.fixtures]
+    needs_vectors = any(mode != "lexical" for mode in args.modes)
+    embeddings = load_embeddings() if needs_vectors else None
+
+    results = rank_configs(
+        run_sweep(fixtures, args.chunk_sizes, args.overlaps, args.modes, args.k,
+                  embeddings, args.repeat),
+        args.min_recall
+    )
+
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(results.to_string(float_format=lambda value: f"{value:.3f}"))
+
+    if args.csv:
+        results.to_csv(args.csv, index=False)
+
+    acceptable = results[results["meets_bar"]]
+    print()
+    if acceptable.empty:
+        print(f"No configuration reaches recall@k >= {args.min_recall}")
+    else:
+        best = acceptable.iloc[0]
+        print(f"Cheapest config with recall@k >= {args.min_recall}: "
+              f"chunk_size={best['chunk_size']} chunk_overlap={best['chunk_overlap']} "
+              f"mode={best['mode']} k={best['k']} (~{best['prompt_tokens']:.0f} prompt tokens)")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,14 +5,19 @@ import streamlit as st
 from langchain_huggingface import ChatHuggingFace, HuggingFaceEndpoint, HuggingFaceEmbeddings
 from dotenv import load_dotenv
 from youtube_utils import get_youtube_video_id, validate_youtube_id
+from chat_history import ChatHistory, RENDER_WINDOW, REWRITE_HISTORY_TOKENS, REWRITE_TEMPLATE
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from retrieval import (
+    BM25Index, PROMPT_TEMPLATE, RETRIEVAL_MODES, TOP_K,
+    format_docs, retrieve, split_transcript
+)
 from langchain_community.vectorstores import FAISS
 from langchain_core.prompts import PromptTemplate
-from langchain_core.runnables import RunnableParallel, RunnablePassthrough, RunnableLambda
+from langchain_core.runnables import RunnableParallel, RunnableLambda
 from langchain_core.output_parsers import StrOutputParser
 import os
 import base64
+from operator import itemgetter
 
 # Load environment variables
 load_dotenv()
@@ -232,10 +237,18 @@ if 'vector_store' not in st.session_state:
     st.session_state.vector_store = None
 if 'retriever' not in st.session_state:
     st.session_state.retriever = None
+if 'lexical_index' not in st.session_state:
+    st.session_state.lexical_index = None
+if 'retrieval_mode' not in st.session_state:
+    st.session_state.retrieval_mode = "hybrid"
 if 'chain' not in st.session_state:
     st.session_state.chain = None
+if 'rewrite_chain' not in st.session_state:
+    st.session_state.rewrite_chain = None
 if 'chat_history' not in st.session_state:
-    st.session_state.chat_history = []
+    st.session_state.chat_history = ChatHistory()
+if 'history_pages' not in st.session_state:
+    st.session_state.history_pages = 0
 if 'video_processed' not in st.session_state:
     st.session_state.video_processed = False
 if 'current_video_id' not in st.session_state:
@@ -285,7 +298,8 @@ def process_youtube_video(url):
         
         yt_api = YouTubeTranscriptApi()
         transcript_list = yt_api.fetch(video_id)
-        transcript_text = " ".join(snippet.text for snippet in transcript_list.snippets)
+        snippets = [(snippet.text, snippet.start, snippet.duration) for snippet in transcript_list.snippets]
+        transcript_text = " ".join(text for text, _, _ in snippets)
         
         if not transcript_text:
             st.error("❌ No transcript text found")
@@ -297,8 +311,8 @@ def process_youtube_video(url):
         status_text.text("📝 Processing transcript...")
         progress_bar.progress(50)
         
-        splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-        chunks = splitter.create_documents([transcript_text])
+        chunks = split_transcript(snippets)
+        lexical_index = BM25Index(chunks)
         
         # Create vector store
         progress_bar.progress(75)
@@ -313,46 +327,50 @@ def process_youtube_video(url):
         status_text.text("⚙️ Setting up chat system...")
         progress_bar.progress(90)
         
-        retriever = vector_store.as_retriever(search_type="similarity", search_kwargs={"k": 4})
+        def retriever(question):
+            return retrieve(
+                question,
+                lexical_index,
+                vector_store,
+                mode=st.session_state.retrieval_mode,
+                k=TOP_K
+            )
         
         model, _ = initialize_models()
         if model is None:
             return False
         
         prompt = PromptTemplate(
-            template="""
-You are a helpful assistant that answers questions about a YouTube video based on its transcript.
-Answer ONLY from the provided transcript context.
-If the context is insufficient, just say you don't know.
-Be concise and helpful in your responses.
-
-Context: {context}
-
-Question: {question}
-
-Answer:""",
+            template=PROMPT_TEMPLATE,
             input_variables=['context', 'question']
         )
         
-        def format_docs(retrieved_docs):
-            context_text = "\n\n".join(doc.page_content for doc in retrieved_docs)
-            return context_text
-        
+        # Retrieval uses the standalone query; the answer prompt keeps the user's own words
         parallel_chain = RunnableParallel({
-            'context': retriever | RunnableLambda(format_docs),
-            'question': RunnablePassthrough()
+            'context': itemgetter('query') | RunnableLambda(retriever) | RunnableLambda(format_docs),
+            'question': itemgetter('question')
         })
         
         parser = StrOutputParser()
         main_chain = parallel_chain | prompt | model | parser
         
+        # Rewrites follow-ups into standalone questions before retrieval
+        rewrite_prompt = PromptTemplate(
+            template=REWRITE_TEMPLATE,
+            input_variables=['history', 'question']
+        )
+        rewrite_chain = rewrite_prompt | model | parser
+        
         # Store in session state
         st.session_state.vector_store = vector_store
         st.session_state.retriever = retriever
+        st.session_state.lexical_index = lexical_index
         st.session_state.chain = main_chain
+        st.session_state.rewrite_chain = rewrite_chain
         st.session_state.video_processed = True
         st.session_state.current_video_id = video_id
-        st.session_state.chat_history = []  # Clear previous chat history
+        st.session_state.chat_history = ChatHistory()  # Clear previous chat history
+        st.session_state.history_pages = 0
         
         progress_bar.progress(100)
         status_text.text("✅ Video processed successfully!")
@@ -369,6 +387,31 @@ Answer:""",
         progress_bar.empty()
         status_text.empty()
 
+def rewrite_question(question, history):
+    """Rewrite a follow-up into a standalone retrieval query, falling back to the question"""
+    rewritten = st.session_state.rewrite_chain.invoke({
+        'history': history.window_text(REWRITE_HISTORY_TOKENS),
+        'question': question
+    })
+    # Models often add an explanation after the question; keep only the first line
+    for line in rewritten.splitlines():
+        line = line.strip()
+        if line:
+            return line
+    return question
+
+def answer_question(question, rewrite=True):
+    """Answer a question and record it, rewriting follow-ups into standalone retrieval queries"""
+    history = st.session_state.chat_history
+    
+    query = question
+    if rewrite and history:
+        query = rewrite_question(question, history)
+    
+    response = st.session_state.chain.invoke({'question': question, 'query': query})
+    history.add(question, response)
+    st.session_state.history_pages = 0
+
 def create_responsive_header():
     """Create responsive header with logo"""
     try:
@@ -431,8 +474,16 @@ def create_sidebar():
         if st.session_state.video_processed:
             st.success("✅ Video Ready")
             
+            st.selectbox(
+                "Retrieval mode:",
+                RETRIEVAL_MODES,
+                key="retrieval_mode",
+                help="Hybrid fuses keyword and semantic search; lexical skips the embedding call"
+            )
+            
             if st.button("🗑️ Clear Chat History", use_container_width=True):
-                st.session_state.chat_history = []
+                st.session_state.chat_history.clear()
+                st.session_state.history_pages = 0
                 st.rerun()
         else:
             st.warning("⚠️ No video processed yet")
@@ -476,8 +527,7 @@ def create_sample_questions():
             if st.button(question, key=f"sample_{i}", use_container_width=True):
                 with st.spinner("🤔 Thinking..."):
                     try:
-                        response = st.session_state.chain.invoke(question)
-                        st.session_state.chat_history.append((question, response))
+                        answer_question(question, rewrite=False)
                         st.rerun()
                     except Exception as e:
                         st.error(f"❌ Error: {e}")
@@ -489,8 +539,7 @@ def create_sample_questions():
             if cols[col_idx].button(question, key=f"sample_{i}"):
                 with st.spinner("🤔 Thinking..."):
                     try:
-                        response = st.session_state.chain.invoke(question)
-                        st.session_state.chat_history.append((question, response))
+                        answer_question(question, rewrite=False)
                         st.rerun()
                     except Exception as e:
                         st.error(f"❌ Error: {e}")
@@ -547,22 +596,21 @@ def main():
     if st.session_state.video_processed:
         st.header("💬 Chat with the Video")
         
-        # Display chat history
-        if st.session_state.chat_history:
-            for i, (question, answer) in enumerate(st.session_state.chat_history):
-                with st.container():
-                    st.markdown(f"""
-                    <div class="user-message">
-                        💭 {question}
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    st.markdown(f"""
-                    <div class="bot-message">
-                        🤖 {answer}
-                    </div>
-                    """, unsafe_allow_html=True)
-                st.divider()
+        # Display chat history - only the recent window, older turns on demand
+        history = st.session_state.chat_history
+        if history.summary:
+            with st.expander(f"🗂️ Earlier conversation ({history.compacted} turns summarized)"):
+                st.markdown(history.summary)
+        
+        if history:
+            visible = RENDER_WINDOW * (st.session_state.history_pages + 1)
+            if len(history) > visible:
+                if st.button(f"⬆️ Show older messages ({len(history) - visible} hidden)", use_container_width=True):
+                    st.session_state.history_pages += 1
+                    st.rerun()
+            
+            st.markdown(history.render(visible), unsafe_allow_html=True)
+            st.divider()
         
         # Chat input - responsive form
         with st.form("chat_form", clear_on_submit=True):
@@ -578,11 +626,8 @@ def main():
             if submit_button and user_question:
                 with st.spinner("🤔 Thinking..."):
                     try:
-                        # Get response from the chain
-                        response = st.session_state.chain.invoke(user_question)
-                        
-                        # Add to chat history
-                        st.session_state.chat_history.append((user_question, response))
+                        # Get response from the chain and add it to chat history
+                        answer_question(user_question)
                         
                         # Rerun to display the new message
                         st.rerun()
@@ -0,0 +1,283 @@
+"""
+Retrieval Module
+Transcript chunking, a compact BM25 inverted index and hybrid retrieval helpers.
+
+The lexical index is built at ingest over the same chunks that go into FAISS,
+so keyword questions (names, numbers, jargon) can be answered without an
+embedding call, and both rankings can be fused for the hybrid mode.
+"""
+
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_right
+from collections import Counter, defaultdict
+
+# Default chunking parameters used at ingest
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+TOP_K = 4
+
+# Supported retrieval modes
+RETRIEVAL_MODES = ("hybrid", "vector", "lexical")
+
+# Constant from the original reciprocal rank fusion paper
+RRF_K = 60
+
+PROMPT_TEMPLATE = """
+You are a helpful assistant that answers questions about a YouTube video based on its transcript.
+Answer ONLY from the provided transcript context.
+If the context is insufficient, just say you don't know.
+Be concise and helpful in your responses.
+
+Context: {context}
+
+Question: {question}
+
+Answer:"""
+
+_TOKEN_PATTERN = re.compile(r"[0-9a-z]+(?:['.][0-9a-z]+)*")
+
+_STOPWORDS = frozenset("""
+a about an and are as at be but by can did do does for from had has have he her
+his how i if in into is it its me my of on or our she so that the their them
+then there these they this to was we were what when where which who why will
+with would you your
+""".split())
+
+
+def tokenize(text):
+    """
+    Split text into lowercase index terms, dropping common stopwords.
+
+    Args:
+        text (str): Text to tokenize
+
+    Returns:
+        list: List of terms
+
+    Example:
+        >>> tokenize("What does the speaker say about GPT-4?")
+        ['speaker', 'say', 'gpt', '4']
+    """
+    if not text:
+        return []
+    return [t for t in _TOKEN_PATTERN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def format_docs(retrieved_docs):
+    """Join retrieved chunks into the prompt context."""
+    return "\n\n".join(doc.page_content for doc in retrieved_docs)
+
+
+def estimate_tokens(text):
+    """
+    Estimate the number of LLM tokens in a piece of text.
+
+    Uses the common ~4 characters per token heuristic, which is close enough
+    to compare retrieval configurations without loading a tokenizer.
+
+    Args:
+        text (str): Text to measure
+
+    Returns:
+        int: Approximate token count
+
+    Example:
+        >>> estimate_tokens("What is this video about?")
+        7
+    """
+    return math.ceil(len(text) / 4)
+
+
+def split_transcript(snippets, chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP):
+    """
+    Split transcript snippets into chunks that remember their time span.
+
+    Args:
+        snippets (list): (text, start, duration) tuples in transcript order
+        chunk_size (int): Maximum characters per chunk
+        chunk_overlap (int): Characters shared between neighbouring chunks
+
+    Returns:
+        list: LangChain Documents with ``chunk_id``, ``start`` and ``end``
+        (seconds) in their metadata
+    """
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+    offsets = []
+    parts = []
+    position = 0
+    for text, _, _ in snippets:
+        offsets.append(position)
+        parts.append(text)
+        position += len(text) + 1
+    transcript_text = " ".join(parts)
+    if not transcript_text.strip():
+        return []
+
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        add_start_index=True
+    )
+    chunks = splitter.create_documents([transcript_text])
+
+    for chunk_id, chunk in enumerate(chunks):
+        begin = max(chunk.metadata.get("start_index", 0), 0)
+        finish = begin + max(len(chunk.page_content) - 1, 0)
+        first = max(bisect_right(offsets, begin) - 1, 0)
+        last = max(bisect_right(offsets, finish) - 1, first)
+        _, last_start, last_duration = snippets[last]
+        chunk.metadata.update({
+            "chunk_id": chunk_id,
+            "start": snippets[first][1],
+            "end": last_start + last_duration,
+        })
+    return chunks
+
+
+class BM25Index:
+    """
+    In-memory BM25 inverted index over a fixed list of documents.
+
+    Postings are stored per term as two parallel arrays: document ids
+    (``array('I')``) and precomputed BM25 impact scores (``array('f')``).
+    Scoring a query is therefore a sum over the postings of its terms, with
+    no per-query length normalisation or IDF work.
+    """
+
+    def __init__(self, documents, k1=1.5, b=0.75):
+        """
+        Build the index.
+
+        Args:
+            documents (list): LangChain Documents (or plain strings) to index
+            k1 (float): BM25 term-frequency saturation
+            b (float): BM25 length normalisation strength
+        """
+        self.documents = list(documents)
+        self.k1 = k1
+        self.b = b
+
+        term_freqs = [Counter(tokenize(_page_content(doc))) for doc in self.documents]
+        lengths = [sum(tf.values()) for tf in term_freqs]
+        avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+
+        doc_ids = defaultdict(list)
+        freqs = defaultdict(list)
+        for doc_id, tf in enumerate(term_freqs):
+            for term, count in tf.items():
+                doc_ids[term].append(doc_id)
+                freqs[term].append(count)
+
+        n_docs = len(self.documents)
+        self.postings = {}
+        for term, ids in doc_ids.items():
+            idf = math.log(1 + (n_docs - len(ids) + 0.5) / (len(ids) + 0.5))
+            weights = array("f")
+            for doc_id, count in zip(ids, freqs[term]):
+                norm = 1 - b + b * (lengths[doc_id] / avg_length if avg_length else 0)
+                weights.append(idf * count * (k1 + 1) / (count + k1 * norm))
+            self.postings[term] = (array("I", ids), weights)
+
+    def __len__(self):
+        return len(self.documents)
+
+    def search(self, query, k=TOP_K):
+        """
+        Rank documents for a query.
+
+        Args:
+            query (str): Free-text query
+            k (int): Number of results to return
+
+        Returns:
+            list: (doc_id, score) tuples, best first
+        """
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            for doc_id, weight in zip(*posting):
+                scores[doc_id] += weight
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def get_relevant_documents(self, query, k=TOP_K):
+        """Return the top ``k`` documents for a query."""
+        return [self.documents[doc_id] for doc_id, _ in self.search(query, k)]
+
+    def memory_bytes(self):
+        """Approximate size of the postings arrays in bytes."""
+        return sum(
+            ids.itemsize * len(ids) + weights.itemsize * len(weights)
+            for ids, weights in self.postings.values()
+        )
+
+
+def reciprocal_rank_fusion(rankings, k=RRF_K):
+    """
+    Fuse several rankings with reciprocal rank fusion.
+
+    Args:
+        rankings (list): Lists of ids, each ordered best first
+        k (int): RRF damping constant
+
+    Returns:
+        list: Ids ordered by fused score, best first
+
+    Example:
+        >>> reciprocal_rank_fusion([[1, 2, 3], [3, 1]])
+        [1, 3, 2]
+    """
+    scores = defaultdict(float)
+    for ranking in rankings:
+        for rank, item in enumerate(ranking):
+            scores[item] += 1.0 / (k + rank + 1)
+    return sorted(scores, key=scores.get, reverse=True)
+
+
+def retrieve(query, lexical_index, vector_store=None, mode="hybrid", k=TOP_K, fetch_k=None):
+    """
+    Retrieve transcript chunks for a query.
+
+    Args:
+        query (str): User question
+        lexical_index (BM25Index): Index built over the ingested chunks
+        vector_store: FAISS store built over the same chunks (required
+            unless ``mode`` is ``lexical``)
+        mode (str): One of ``RETRIEVAL_MODES``
+        k (int): Number of chunks to return
+        fetch_k (int): Candidates taken from each ranking before fusion
+            (defaults to ``2 * k``)
+
+    Returns:
+        list: LangChain Documents, best first
+
+    Raises:
+        ValueError: If the mode is unknown, or is vector-backed and no
+            vector store was given
+    """
+    if mode not in RETRIEVAL_MODES:
+        raise ValueError(f"Unknown retrieval mode: {mode!r}")
+    if mode == "lexical":
+        return lexical_index.get_relevant_documents(query, k)
+    if vector_store is None:
+        raise ValueError(f"Retrieval mode {mode!r} requires a vector store")
+    if mode == "vector":
+        return vector_store.similarity_search(query, k=k)
+
+    fetch_k = fetch_k or 2 * k
+    lexical_ids = [doc_id for doc_id, _ in lexical_index.search(query, fetch_k)]
+    vector_ids = [
+        doc.metadata["chunk_id"]
+        for doc in vector_store.similarity_search(query, k=fetch_k)
+    ]
+    fused = reciprocal_rank_fusion([lexical_ids, vector_ids])
+    return [lexical_index.documents[doc_id] for doc_id in fused[:k]]
+
+
+def _page_content(doc):
+    return doc if isinstance(doc, str) else doc.page_content
@@ -4,18 +4,200 @@ A clean utility module for YouTube video ID extraction and validation.
 """
 
 import re
-from urllib.parse import urlparse, parse_qs
+from collections import namedtuple
+from urllib.parse import urlparse, unquote
+
+# A parsed YouTube link: canonical 11-character video ID (None for
+# playlist-only links), start offset in seconds and playlist ID
+YouTubeLink = namedtuple("YouTubeLink", ["video_id", "start", "playlist_id"])
+
+_ID = r"[0-9A-Za-z_-]{11}"
+_HOST = r"(?:(?:www|m|music)\.)?(?:youtube(?:-nocookie)?\.com|youtu\.be)"
+
+# Compiled once at import; reused by every call. Host and path are matched
+# in a single anchored pass (only scheme and host are case-insensitive); the
+# query string is sliced off the remainder and only the parameters we use
+# are extracted from it.
+_VIDEO_ID_PATTERN = re.compile(rf"^{_ID}$")
+_URL_PATTERN = re.compile(
+    r"(?i:https?://)?(?:"
+    r"(?i:(?:www\.|m\.|music\.)?youtube(?:-nocookie)?\.com)(?::\d+)?"
+    rf"/(?:(?:embed|v|e|shorts|live)/({_ID})/?|watch/?|playlist/?)"
+    rf"|(?i:youtu\.be)(?::\d+)?/({_ID})/?"
+    r")(?=[?#]|$)"
+)
+_URL_FINDER = re.compile(rf"(?<![\w.-])(?:https?://)?{_HOST}(?::\d+)?/[^\s\"'<>]*", re.IGNORECASE)
+_PARAM_PATTERN = re.compile(r"(?<![^?&#])(v|t|start|time_continue|list)=([^&#]*)")
+_VIDEO_PARAM_PATTERN = re.compile(r"(?<![^?&#])v=([^&#]*)")
+_TIME_PATTERN = re.compile(r"^(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s?)?$", re.ASCII)
+_WHITESPACE = re.compile(r"\s")
+
+# Punctuation that ends a sentence rather than a URL in free text
+_TRAILING_PUNCTUATION = ".,;:!?"
+_CLOSING_BRACKETS = {")": "(", "]": "["}
+
+
+def _parse_start(value):
+    """Convert a ``t``/``start`` value such as ``90``, ``90s`` or ``1h2m3s`` to seconds."""
+    if value.isdecimal() and value.isascii():
+        return int(value)
+    match = _TIME_PATTERN.match(value)
+    if not match or not value:
+        return None
+    hours, minutes, seconds = (int(part) if part else 0 for part in match.groups())
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def _trim_candidate(candidate):
+    """Strip sentence punctuation and unbalanced closing brackets off a URL found in text."""
+    while True:
+        candidate = candidate.rstrip(_TRAILING_PUNCTUATION)
+        opening = _CLOSING_BRACKETS.get(candidate[-1:])
+        if opening is None or candidate.count(opening) >= candidate.count(candidate[-1]):
+            return candidate
+        candidate = candidate[:-1]
+
+
+def parse_youtube_url(url):
+    """
+    Parse a YouTube URL into its canonical video ID, start time and playlist.
+
+    Supported formats:
+    - https://www.youtube.com/watch?v=VIDEO_ID (plus &t=, &start=, &list=)
+    - https://youtu.be/VIDEO_ID?t=90
+    - https://www.youtube.com/embed/VIDEO_ID, /v/VIDEO_ID, /e/VIDEO_ID
+    - https://www.youtube.com/shorts/VIDEO_ID
+    - https://www.youtube.com/live/VIDEO_ID
+    - https://www.youtube.com/playlist?list=PLAYLIST_ID
+    - m., music. and youtube-nocookie.com hosts, with or without a scheme
+
+    Args:
+        url (str): YouTube URL
+
+    Returns:
+        YouTubeLink: Parsed link, or None if the URL is not a recognised
+        YouTube video or playlist link, or is followed by more text
+
+    Example:
+        >>> parse_youtube_url("https://youtu.be/dQw4w9WgXcQ?t=1m30s")
+        YouTubeLink(video_id='dQw4w9WgXcQ', start=90, playlist_id=None)
+    """
+    if not url or not isinstance(url, str):
+        return None
+
+    url = url.strip()
+    match = _URL_PATTERN.match(url)
+    if not match:
+        return None
+    video_id = match.group(1) or match.group(2)
+
+    query = ""
+    fragment = ""
+    rest = url[match.end():]
+    if rest:
+        if _WHITESPACE.search(rest):
+            return None
+        if rest[0] == "?":
+            query, _, fragment = rest[1:].partition("#")
+        else:
+            fragment = rest[1:]
+
+    start = None
+    playlist_id = None
+    params = _PARAM_PATTERN.findall(query) if query else []
+    if fragment:
+        params.extend(_PARAM_PATTERN.findall(fragment))
+    for key, value in params:
+        if "%" in value:
+            value = unquote(value)
+        if key == "v":
+            if video_id is None:
+                if not _VIDEO_ID_PATTERN.match(value):
+                    return None
+                video_id = value
+        elif key == "list":
+            if value:
+                playlist_id = value
+        elif start is None:
+            start = _parse_start(value)
+
+    if video_id is None and playlist_id is None:
+        return None
+    return YouTubeLink(video_id, start, playlist_id)
+
+
+def _find_links(line, tried):
+    """Parse every URL candidate in a line, skipping the already-rejected ``tried``."""
+    for candidate in _URL_FINDER.findall(line):
+        candidate = _trim_candidate(candidate)
+        if candidate != tried:
+            yield parse_youtube_url(candidate)
+
+
+def extract_youtube_links(lines, dedupe=True):
+    """
+    Extract YouTube links from free text, one line at a time.
+
+    Every YouTube URL found in each line is parsed, so log lines with
+    surrounding text work as-is. Trailing sentence punctuation and unbalanced
+    closing brackets, as in ``(see youtu.be/VIDEO_ID).``, are not treated as
+    part of the URL. This is a generator, so arbitrarily large
+    inputs are processed in constant memory apart from the dedupe set.
+
+    Args:
+        lines (iterable): Strings to scan, e.g. an open file
+        dedupe (bool): Yield each video (or playlist-only link) once,
+            keeping the first occurrence
+
+    Yields:
+        YouTubeLink: Parsed links in input order
+
+    Example:
+        >>> lines = ["see https://youtu.be/dQw4w9WgXcQ and",
+        ...          "youtube.com/shorts/dQw4w9WgXcQ again"]
+        >>> [link.video_id for link in extract_youtube_links(lines)]
+        ['dQw4w9WgXcQ']
+    """
+    seen = set()
+    for line in lines:
+        # Fast path for one URL per line; otherwise scan the line for URLs
+        line = line.strip()
+        whole = _trim_candidate(line)
+        link = parse_youtube_url(whole)
+        links = (link,) if link is not None else _find_links(line, whole)
+        for link in links:
+            if link is None:
+                continue
+            if dedupe:
+                key = link.video_id or link.playlist_id
+                if key in seen:
+                    continue
+                seen.add(key)
+            yield link
+
+
+def extract_youtube_links_from_file(path, dedupe=True, encoding="utf-8"):
+    """
+    Stream YouTube links out of a text file.
+
+    Args:
+        path (str): File to scan
+        dedupe (bool): Yield each video (or playlist-only link) once
+        encoding (str): File encoding; undecodable bytes are replaced
+
+    Yields:
+        YouTubeLink: Parsed links in file order
+    """
+    with open(path, encoding=encoding, errors="replace") as f:
+        yield from extract_youtube_links(f, dedupe=dedupe)
+
 
 def get_youtube_video_id(url):
     """
     Extract YouTube video ID from various YouTube URL formats.
     
-    Supported formats:
-    - https://www.youtube.com/watch?v=VIDEO_ID
-    - https://youtu.be/VIDEO_ID
-    - https://www.youtube.com/embed/VIDEO_ID
-    - https://www.youtube.com/v/VIDEO_ID
-    - https://m.youtube.com/watch?v=VIDEO_ID
+    Supports every format handled by ``parse_youtube_url``; playlist-only
+    links have no video ID.
     
     Args:
         url (str): YouTube video URL
@@ -27,38 +209,27 @@ def get_youtube_video_id(url):
         >>> get_youtube_video_id("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
         'dQw4w9WgXcQ'
     """
-    
+    # Same rules as parse_youtube_url, but only the video ID is extracted
     if not url or not isinstance(url, str):
         return None
-        
-    # Handle different YouTube URL patterns
-    patterns = [
-        r'(?:v=|\/)([0-9A-Za-z_-]{11}).*',  # Standard and other formats
-        r'(?:embed\/)([0-9A-Za-z_-]{11})',  # Embed format
-        r'(?:youtu\.be\/)([0-9A-Za-z_-]{11})', # Shortened format
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    
-    # Alternative method using urllib.parse for standard URLs
-    try:
-        parsed_url = urlparse(url)
-        if parsed_url.hostname in ['www.youtube.com', 'youtube.com', 'm.youtube.com']:
-            if parsed_url.path == '/watch':
-                return parse_qs(parsed_url.query).get('v', [None])[0]
-            elif parsed_url.path.startswith('/embed/'):
-                return parsed_url.path.split('/')[2]
-            elif parsed_url.path.startswith('/v/'):
-                return parsed_url.path.split('/')[2]
-        elif parsed_url.hostname == 'youtu.be':
-            return parsed_url.path[1:]  # Remove the leading '/'
-    except Exception:
-        pass
-    
-    return None
+
+    url = url.strip()
+    match = _URL_PATTERN.match(url)
+    if not match:
+        return None
+    if _WHITESPACE.search(url, match.end()):
+        return None
+    video_id = match.group(1) or match.group(2)
+    if video_id:
+        return video_id
+
+    param = _VIDEO_PARAM_PATTERN.search(url, match.end())
+    if not param:
+        return None
+    value = param.group(1)
+    if "%" in value:
+        value = unquote(value)
+    return value if _VIDEO_ID_PATTERN.match(value) else None
 
 def validate_youtube_id(video_id):
     """
@@ -78,8 +249,7 @@ def validate_youtube_id(video_id):
         return False
     
     # YouTube video IDs are 11 characters long and contain letters, numbers, hyphens, and underscores
-    pattern = r'^[0-9A-Za-z_-]{11}$'
-    return bool(re.match(pattern, video_id))
+    return bool(_VIDEO_ID_PATTERN.match(video_id))
 
 def extract_and_validate_youtube_id(url):
     """
@@ -117,7 +287,8 @@ def is_youtube_url(url):
         
     try:
         parsed_url = urlparse(url)
-        youtube_domains = ['www.youtube.com', 'youtube.com', 'm.youtube.com', 'youtu.be']
+        youtube_domains = ['www.youtube.com', 'youtube.com', 'm.youtube.com', 'music.youtube.com',
+                           'www.youtube-nocookie.com', 'youtube-nocookie.com', 'youtu.be']
         return parsed_url.hostname in youtube_domains
     except Exception:
         return False
\ No newline at end of file